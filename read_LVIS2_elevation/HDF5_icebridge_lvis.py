@@ -0,0 +1,423 @@
+#!/usr/bin/env python
+u"""
+HDF5_icebridge_lvis.py
+Written by Tyler Sutterley (10/2026)
+
+Writes IceBridge Geolocated LVIS Elevation Product data to HDF5
+
+CALLING SEQUENCE:
+    LVIS_L2_input = read_LVIS2_elevation(input_file)
+    HDF5_icebridge_lvis(LVIS_L2_input, LVIS_L2_input['LDS_VERSION'],
+        FILENAME=output_file, INPUT_FILE=input_file)
+
+INPUTS:
+    ILVIS2_MDS: python dictionary of LVIS Level-2 variables
+    LDS_VERSION: LVIS Data Structure (LDS) version
+
+OPTIONS:
+    FILENAME: output HDF5 file
+    INPUT_FILE: input Level-2 LVIS elevation file
+    COMPRESSION: compression filter for output HDF5 datasets
+        gzip
+        lzf
+        bitshuffle (requires hdf5plugin)
+        lz4 (requires hdf5plugin)
+        zstd (requires hdf5plugin)
+    THREADS: number of threads for compressing gzip chunks
+
+PYTHON DEPENDENCIES:
+    numpy: Scientific Computing Tools For Python
+        https://numpy.org
+    h5py: Python interface for Hierarchal Data Format 5 (HDF5)
+        https://www.h5py.org/
+    hdf5plugin: Additional compression filters for h5py (optional)
+        https://github.com/silx-kit/hdf5plugin
+
+UPDATE HISTORY:
+    Updated 10/2026: use the default chunk cache for output files
+        always output LVIS channel flags as unsigned bytes
+        use the requested compression filter for integer variables
+        support files without shots by skipping extents and ranges
+        check that hdf5plugin is available for the additional filters
+    Written 10/2026: single copy of the HDF5 writer for the conversion programs
+"""
+import os
+import h5py
+import zlib
+import time
+import datetime
+import importlib.util
+import warnings
+import concurrent.futures
+import numpy as np
+
+#-- attempt imports
+try:
+    import hdf5plugin
+except (ImportError, ModuleNotFoundError) as e:
+    warnings.filterwarnings("module")
+    warnings.warn("hdf5plugin not available", ImportWarning)
+
+#-- PURPOSE: build the HDF5 variable attributes for LVIS Level-2 datasets
+def _build_attrs():
+    #-- Defining output HDF5 variable attributes
+    attributes = {}
+    #-- LVIS_LFID
+    attributes['LVIS_LFID'] = {}
+    attributes['LVIS_LFID']['long_name'] = 'LVIS Record Index'
+    attributes['LVIS_LFID']['description'] = ('LVIS file identification, '
+        'including date and time of collection and file number. The third '
+        'through seventh values in first field represent the Modified Julian '
+        'Date of data collection.')
+    #-- Shot Number
+    attributes['Shot_Number'] = {}
+    attributes['Shot_Number']['long_name'] = ('Shot Number')
+    attributes['Shot_Number']['description'] = ('Laser shot assigned during '
+        'collection')
+    #-- Time
+    attributes['Time'] = {}
+    attributes['Time']['long_name'] = 'Transmit time of each shot'
+    attributes['Time']['units'] = 'Seconds'
+    attributes['Time']['description'] = 'UTC decimal seconds of the day'
+    #-- J2000
+    attributes['J2000'] = {}
+    attributes['J2000']['long_name'] = ('Transmit time of each shot in J2000 '
+        'seconds')
+    attributes['J2000']['units'] = 'seconds since 2000-01-01 12:00:00 UTC'
+    attributes['J2000']['description'] = ('The transmit time of each shot in '
+        'the 1 second frame measured as UTC seconds elapsed since Jan 1 '
+        '2000 12:00:00 UTC.')
+    #-- Centroid
+    attributes['Longitude_Centroid'] = {}
+    attributes['Longitude_Centroid']['long_name'] = 'Longitude_Centroid'
+    attributes['Longitude_Centroid']['units'] = 'Degrees East'
+    attributes['Longitude_Centroid']['description'] = ('Corresponding longitude '
+        'of the LVIS Level-1B waveform centroid')
+    attributes['Latitude_Centroid'] = {}
+    attributes['Latitude_Centroid']['long_name'] = 'Latitude_Centroid'
+    attributes['Latitude_Centroid']['units'] = 'Degrees North'
+    attributes['Latitude_Centroid']['description'] = ('Corresponding latitude of '
+        'the LVIS Level-1B waveform centroid')
+    attributes['Elevation_Centroid'] = {}
+    attributes['Elevation_Centroid']['long_name'] = 'Elevation_Centroid'
+    attributes['Elevation_Centroid']['units'] = 'Meters'
+    attributes['Elevation_Centroid']['description'] = ('Elevation surface of the '
+        'LVIS Level-1B waveform centroid')
+    #-- Lowest mode
+    attributes['Longitude_Low'] = {}
+    attributes['Longitude_Low']['long_name'] = 'Longitude_Low'
+    attributes['Longitude_Low']['units'] = 'Degrees East'
+    attributes['Longitude_Low']['description'] = ('Longitude of the '
+        'lowest detected mode within the LVIS Level-1B waveform')
+    attributes['Latitude_Low'] = {}
+    attributes['Latitude_Low']['long_name'] = 'Latitude_Low'
+    attributes['Latitude_Low']['units'] = 'Degrees North'
+    attributes['Latitude_Low']['description'] = ('Latitude of the '
+        'lowest detected mode within the LVIS Level-1B waveform')
+    attributes['Elevation_Low'] = {}
+    attributes['Elevation_Low']['long_name'] = 'Elevation_Low'
+    attributes['Elevation_Low']['units'] = 'Meters'
+    attributes['Elevation_Low']['description'] = ('Mean Elevation of the '
+        'lowest detected mode within the LVIS Level-1B waveform')
+    #-- Highest mode
+    attributes['Longitude_High'] = {}
+    attributes['Longitude_High']['long_name'] = 'Longitude_High'
+    attributes['Longitude_High']['units'] = 'Degrees East'
+    attributes['Longitude_High']['description'] = ('Longitude of the '
+        'highest detected mode within the LVIS Level-1B waveform')
+    attributes['Latitude_High'] = {}
+    attributes['Latitude_High']['long_name'] = 'Latitude_High'
+    attributes['Latitude_High']['units'] = 'Degrees North'
+    attributes['Latitude_High']['description'] = ('Latitude of the '
+        'highest detected mode within the LVIS Level-1B waveform')
+    attributes['Elevation_High'] = {}
+    attributes['Elevation_High']['long_name'] = 'Elevation_High'
+    attributes['Elevation_High']['units'] = 'Meters'
+    attributes['Elevation_High']['description'] = ('Mean Elevation of the '
+        'highest detected mode within the LVIS Level-1B waveform')
+    #-- Highest detected signal
+    attributes['Longitude_Top'] = {}
+    attributes['Longitude_Top']['long_name'] = 'Longitude_Top'
+    attributes['Longitude_Top']['units'] = 'Degrees East'
+    attributes['Longitude_Top']['description'] = ('Longitude of the '
+        'highest detected signal within the LVIS Level-1B waveform')
+    attributes['Latitude_Top'] = {}
+    attributes['Latitude_Top']['long_name'] = 'Latitude_Top'
+    attributes['Latitude_Top']['units'] = 'Degrees North'
+    attributes['Latitude_Top']['description'] = ('Latitude of the '
+        'highest detected signal within the LVIS Level-1B waveform')
+    attributes['Elevation_Top'] = {}
+    attributes['Elevation_Top']['long_name'] = 'Elevation_Top'
+    attributes['Elevation_Top']['units'] = 'Meters'
+    attributes['Elevation_Top']['description'] = ('Mean Elevation of the '
+        'highest detected signal within the LVIS Level-1B waveform')
+    #-- heights at which a percentage of the waveform energy occurs
+    pv = [10,15,20,25,30,35,40,45,50,55,60,65,70,75,80,85,90,95,96,97,98,99,100]
+    for RH in pv:
+        attributes['RH{0:d}'.format(RH)] = {}
+        attributes['RH{0:d}'.format(RH)]['long_name'] = 'RH{0:d}'.format(RH)
+        attributes['RH{0:d}'.format(RH)]['units'] = 'Meters'
+        attributes['RH{0:d}'.format(RH)]['description'] = ('Height relative to '
+            'the lowest detected mode at which {0:d}%  of the waveform '
+            'energy occurs').format(RH)
+    #-- Laser parmeters
+    #-- Azimuth
+    attributes['Azimuth'] = {}
+    attributes['Azimuth']['long_name'] = 'Azimuth'
+    attributes['Azimuth']['units'] = 'degrees'
+    attributes['Azimuth']['description'] = 'Azimuth angle of the laser beam.'
+    attributes['Azimuth']['valid_min'] = 0.0
+    attributes['Azimuth']['valid_max'] = 360.0
+    #-- Incident Angle
+    attributes['Incident_Angle'] = {}
+    attributes['Incident_Angle']['long_name'] = 'Incident_Angle'
+    attributes['Incident_Angle']['units'] = 'degrees'
+    attributes['Incident_Angle']['description'] = ('Off-nadir incident angle '
+        'of the laser beam.')
+    attributes['Incident_Angle']['valid_min'] = 0.0
+    attributes['Incident_Angle']['valid_max'] = 360.0
+    #-- Range
+    attributes['Range'] = {}
+    attributes['Range']['long_name'] = 'Range'
+    attributes['Range']['units'] = 'meters'
+    attributes['Range']['description'] = ('Distance between the instrument and '
+        'the ground.')
+    #-- Complexity
+    attributes['Complexity'] = {}
+    attributes['Complexity']['long_name'] = 'Complexity'
+    attributes['Complexity']['description'] = ('Complexity metric for the '
+        'return waveform.')
+    #-- Flags
+    attributes['Flag1'] = {}
+    attributes['Flag1']['long_name'] = 'Flag1'
+    attributes['Flag1']['description'] = ('Flag indicating LVIS channel used '
+        'to locate lowest detected mode.')
+    attributes['Flag2'] = {}
+    attributes['Flag2']['long_name'] = 'Flag1'
+    attributes['Flag2']['description'] = ('Flag indicating LVIS channel used '
+        'to calculate RH metrics.')
+    attributes['Flag3'] = {}
+    attributes['Flag3']['long_name'] = 'Flag1'
+    attributes['Flag3']['description'] = ('Flag indicating LVIS channel '
+        'waveform contained in Level-1B file.')
+    #-- return the variable attributes
+    return attributes
+
+#-- HDF5 variable attributes (built once when the module is loaded)
+_LVIS_ATTRS = _build_attrs()
+
+#-- PURPOSE: calculate the minimum and maximum of an array in a single
+#-- pass over memory by reducing blocks small enough to stay in cache
+def calc_min_max(data, BLOCKSIZE=65536):
+    vmin,vmax = np.inf,-np.inf
+    for i in range(0, len(data), BLOCKSIZE):
+        block = data[i:i+BLOCKSIZE]
+        vmin = min(vmin, block.min())
+        vmax = max(vmax, block.max())
+    return (vmin,vmax)
+
+#-- PURPOSE: shuffle and deflate a chunk of data as would be done by the
+#-- HDF5 shuffle and gzip filters
+def deflate_chunk(data, LEVEL=4):
+    #-- reorder bytes into planes of equal significance
+    itemsize = data.dtype.itemsize
+    shuffled = data.view(np.uint8).reshape(-1,itemsize).T
+    return zlib.compress(shuffled.tobytes(), LEVEL)
+
+#-- PURPOSE: write a dataset from chunks compressed in parallel threads
+#-- bypassing the HDF5 filter pipeline
+def write_deflate_chunks(dset, data, CHUNKSIZE, executor):
+    #-- split data into full chunks (padding the final chunk)
+    n_chunks = -(-len(data)//CHUNKSIZE)
+    padded = np.empty((n_chunks*CHUNKSIZE), dtype=data.dtype)
+    padded[:len(data)] = data
+    padded[len(data):] = 0
+    blocks = padded.reshape(n_chunks,CHUNKSIZE)
+    #-- write each compressed chunk directly to the dataset in order
+    for i,chunk in enumerate(executor.map(deflate_chunk, blocks)):
+        dset.id.write_direct_chunk((i*CHUNKSIZE,), chunk)
+
+#-- HDF5 groups and variables for each LVIS Data Structure (LDS) version
+_LAYOUT = {}
+_LAYOUT['1.04'] = {}
+_LAYOUT['1.04']['Time'] = ('LVIS_LFID','Time','J2000')
+_LAYOUT['1.04']['Geolocation'] = ('Longitude_Centroid','Longitude_Low',
+    'Longitude_High','Latitude_Centroid','Latitude_Low','Latitude_High')
+_LAYOUT['1.04']['Elevation_Surfaces'] = ('Elevation_Centroid',
+    'Elevation_Low','Elevation_High')
+_LAYOUT['2.0.2'] = {}
+_LAYOUT['2.0.2']['Time'] = ('LVIS_LFID','Time','J2000')
+_LAYOUT['2.0.2']['Geolocation'] = ('Longitude_Low','Longitude_High',
+    'Longitude_Top','Latitude_Low','Latitude_High','Latitude_Top')
+_LAYOUT['2.0.2']['Elevation_Surfaces'] = ('Elevation_Low','Elevation_High',
+    'Elevation_Top')
+#-- variables specific to the LDS version 2.0.2
+_LAYOUT['2.0.2']['Waveform'] = ('RH10','RH15','RH20','RH25','RH30','RH35',
+    'RH40','RH45','RH50','RH55','RH60','RH65','RH70','RH75','RH80','RH85',
+    'RH90','RH95','RH96','RH97','RH98','RH99','RH100','Complexity')
+_LAYOUT['2.0.2']['Instrument_Parameters'] = ('Azimuth','Incident_Angle',
+    'Range','Flag1','Flag2','Flag3')
+
+#-- enumerated flag variables stored as unsigned bytes
+_FLAGS = ('Flag1','Flag2','Flag3')
+
+#-- PURPOSE: output HDF5 file with geolocated elevation surfaces calculated
+#-- from LVIS Level-1b waveform products
+def HDF5_icebridge_lvis(ILVIS2_MDS,LDS_VERSION,FILENAME=None,INPUT_FILE=None,
+    COMPRESSION='lzf',THREADS=None):
+    #-- check that hdf5plugin is available for the additional filters
+    if (COMPRESSION in ('bitshuffle','lz4','zstd')) and \
+        (importlib.util.find_spec('hdf5plugin') is None):
+        raise ModuleNotFoundError('hdf5plugin is required for {0} '
+            'compression'.format(COMPRESSION))
+    #-- Dimensions of parameters
+    n_records, = ILVIS2_MDS['Shot_Number'].shape
+    #-- explicit chunk size and compression filters for each dataset
+    #-- separated for floating point and integer data types
+    #-- (h5py chooses the chunk size for files without any shots)
+    chunks = (min(n_records,65536),) if (n_records > 0) else True
+
+    #-- build smaller files in memory and write to disk in a single pass
+    #-- when the file is closed (larger files are written directly)
+    nbytes = sum(getattr(v,'nbytes',0) for v in ILVIS2_MDS.values())
+    if (nbytes < 512*1024*1024):
+        kwds = dict(driver='core', backing_store=True,
+            block_size=64*1024*1024)
+    else:
+        kwds = {}
+    #-- open output HDF5 file with the default chunk cache
+    #-- (whole columns are written at once so chunks are never re-read)
+    #-- use the latest file format for compact object headers and attributes
+    fileID = h5py.File(FILENAME, 'w', libver='latest', **kwds)
+    #-- hold all metadata in a fixed-size metadata cache until the file
+    #-- is closed (disable cache evictions and automatic resizing)
+    mdc = fileID.id.get_mdc_config()
+    mdc.set_initial_size = True
+    mdc.initial_size = 8*1024*1024
+    mdc.incr_mode = mdc.flash_incr_mode = mdc.decr_mode = 0
+    mdc.evictions_enabled = False
+    fileID.id.set_mdc_config(mdc)
+    filters = {}
+    filters['f'] = dict(chunks=chunks)
+    filters['i'] = dict(chunks=chunks)
+    if (COMPRESSION == 'bitshuffle'):
+        #-- bitshuffle with lz4 compression from hdf5plugin
+        filters['f'].update(hdf5plugin.Bitshuffle(cname='lz4'))
+        filters['i'].update(hdf5plugin.Bitshuffle(cname='lz4'))
+    elif (COMPRESSION == 'lz4'):
+        #-- byte shuffle with lz4 compression from hdf5plugin
+        filters['f'].update(hdf5plugin.LZ4(), shuffle=True)
+        filters['i'].update(hdf5plugin.LZ4(), shuffle=True)
+    elif (COMPRESSION == 'zstd'):
+        #-- blosc with bitshuffle and zstd compression from hdf5plugin
+        filters['f'].update(hdf5plugin.Blosc(cname='zstd', clevel=3,
+            shuffle=hdf5plugin.Blosc.BITSHUFFLE))
+        filters['i'].update(hdf5plugin.Blosc(cname='zstd', clevel=3,
+            shuffle=hdf5plugin.Blosc.BITSHUFFLE))
+    else:
+        #-- shuffled gzip, lzf or uncompressed datasets for all variables
+        #-- (gzip is readable by any HDF5 library but lzf is h5py only)
+        filters['f'].update(compression=COMPRESSION, shuffle=True)
+        filters['i'].update(compression=COMPRESSION, shuffle=True)
+    #-- unsigned integers use the same filters as signed integers
+    filters['u'] = filters['i']
+
+    #-- Defining the HDF5 dataset variables
+    h5 = {}
+
+    #-- Defining Shot_Number dimension variable
+    v = np.ascontiguousarray(ILVIS2_MDS['Shot_Number'])
+    h5['Shot_Number'] = fileID.create_dataset('Shot_Number', (n_records,),
+        dtype=v.dtype, **filters[v.dtype.kind])
+    if (n_records > 0):
+        h5['Shot_Number'].write_direct(v)
+    #-- make Shot_Number a dimension scale once and reuse for all variables
+    scale = h5['Shot_Number']
+    scale.make_scale('Shot_Number')
+    #-- add HDF5 variable attributes
+    for att_name,att_val in _LVIS_ATTRS['Shot_Number'].items():
+        h5['Shot_Number'].attrs[att_name] = att_val
+
+    #-- compress gzip chunks of floating point variables in parallel
+    #-- (zlib releases the GIL while compressing)
+    PARALLEL = (COMPRESSION == 'gzip') and (n_records > 0)
+    #-- limit the number of compression threads by default
+    #-- (programs running several writers set the threads for each)
+    if THREADS is None:
+        THREADS = min(4, os.cpu_count() or 1)
+    #-- threads are only started if chunks are submitted for compression
+    with concurrent.futures.ThreadPoolExecutor(max_workers=THREADS) as e:
+        #-- create sub-groups within HDF5 file and output variables in each
+        for group,keys in _LAYOUT[LDS_VERSION].items():
+            fileID.create_group(group)
+            for k in keys:
+                #-- contiguous column buffers are written without a copy
+                v = np.ascontiguousarray(ILVIS2_MDS[k])
+                #-- always store the enumerated flags as unsigned bytes
+                #-- so every output file has the same data types
+                if (k in _FLAGS):
+                    v = v.astype(np.uint8)
+                h5[k] = fileID.create_dataset('{0}/{1}'.format(group,k),
+                    (n_records,), dtype=v.dtype, **filters[v.dtype.kind])
+                if PARALLEL and (v.dtype.kind == 'f'):
+                    write_deflate_chunks(h5[k], v, chunks[0], e)
+                elif (n_records > 0):
+                    h5[k].write_direct(v)
+                #-- add HDF5 variable attributes
+                for att_name,att_val in _LVIS_ATTRS[k].items():
+                    h5[k].attrs[att_name] = att_val
+    #-- attach dimensions after all variables have been created
+    for keys in _LAYOUT[LDS_VERSION].values():
+        for k in keys:
+            h5[k].dims[0].label='Shot_Number'
+            h5[k].dims[0].attach_scale(scale)
+
+    #-- Defining global attributes for output HDF5 file
+    fileID.attrs['featureType'] = 'trajectory'
+    fileID.attrs['title'] = 'IceBridge LVIS L2 Geolocated Surface Elevation'
+    fileID.attrs['comment'] = ('Operation IceBridge products may include test '
+        'flight data that are not useful for research and scientific analysis. '
+        'Test flights usually occur at the beginning of campaigns. Users '
+        'should read flight reports for the flights that collected any of the '
+        'data they intend to use')
+    fileID.attrs['summary'] = ("Surface elevation measurements over areas "
+        "including Greenland and Antarctica. The data were collected as part "
+        "of NASA Operation IceBridge funded campaigns.")
+    fileID.attrs['references'] = '{0}, {1}'.format('http://lvis.gsfc.nasa.gov/',
+        'http://nsidc.org/data/docs/daac/icebridge/ilvis2')
+    fileID.attrs['date_created'] = time.strftime('%Y-%m-%d',time.localtime())
+    fileID.attrs['project'] = 'NASA Operation IceBridge'
+    fileID.attrs['instrument'] = 'Land, Vegetation, and Ice Sensor (LVIS)'
+    fileID.attrs['processing_level'] = '2'
+    fileID.attrs['elevation_file'] = INPUT_FILE
+    #-- LVIS Data Structure (LDS) version
+    #-- https://lvis.gsfc.nasa.gov/Data/Data_Structure/DataStructure_LDS104.html
+    #-- https://lvis.gsfc.nasa.gov/Data/Data_Structure/DataStructure_LDS202.html
+    fileID.attrs['version'] = 'LDSv{0}'.format(LDS_VERSION)
+    #-- Geospatial and temporal parameters
+    fileID.attrs['geospatial_lat_units'] = "degrees_north"
+    fileID.attrs['geospatial_lon_units'] = "degrees_east"
+    fileID.attrs['geospatial_ellipsoid'] = "WGS84"
+    fileID.attrs['time_type'] = 'UTC'
+    fileID.attrs['date_type'] = 'J2000'
+    #-- spatial extents and time ranges are only output for files with shots
+    if (n_records > 0):
+        lat_min,lat_max = calc_min_max(ILVIS2_MDS['Latitude_Low'])
+        lon_min,lon_max = calc_min_max(ILVIS2_MDS['Longitude_Low'])
+        fileID.attrs['geospatial_lat_min'] = lat_min
+        fileID.attrs['geospatial_lat_max'] = lat_max
+        fileID.attrs['geospatial_lon_min'] = lon_min
+        fileID.attrs['geospatial_lon_max'] = lon_max
+        #-- convert start and end time from J2000 seconds into calendar dates
+        epoch = datetime.datetime(2000,1,1,12,0,0)
+        J2000 = ILVIS2_MDS['J2000']
+        t1 = epoch + datetime.timedelta(seconds=float(J2000[0]))
+        t2 = epoch + datetime.timedelta(seconds=float(J2000[-1]))
+        fileID.attrs['RangeBeginningTime'] = t1.strftime('%H:%M:%S')
+        fileID.attrs['RangeEndingTime'] = t2.strftime('%H:%M:%S')
+        fileID.attrs['RangeBeginningDate'] = t1.strftime('%Y:%m:%d')
+        fileID.attrs['RangeEndingDate'] = t2.strftime('%Y:%m:%d')
+        time_coverage_duration = J2000[-1] - J2000[0]
+        fileID.attrs['DurationTime'] ='{0:0.0f}'.format(time_coverage_duration)
+    #-- Closing the HDF5 file
+    fileID.close()
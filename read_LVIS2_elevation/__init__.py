@@ -1,3 +1,6 @@
 import read_LVIS2_elevation.utilities
 from read_LVIS2_elevation.read_LVIS2_elevation import read_LVIS2_elevation
+from read_LVIS2_elevation.read_LVIS2_elevation import \
+    read_LVIS2_elevation_batch
 from read_LVIS2_elevation.convert_julian import convert_julian
+from read_LVIS2_elevation.HDF5_icebridge_lvis import HDF5_icebridge_lvis
@@ -1,7 +1,7 @@
 #!/usr/bin/env python
 u"""
 read_LVIS2_elevation.py
-Written by Tyler Sutterley (11/2021)
+Written by Tyler Sutterley (10/2026)
 
 Reads Operation IceBridge LVIS and LVIS Global Hawk Level-2 data products
     provided by the National Snow and Ice Data Center
@@ -13,6 +13,14 @@ Can be the following file types:
     ILVIS2: IceBridge LVIS Level-2 Geolocated Surface Elevation Product
     ILVGH2: IceBridge LVIS-GH Level-2 Geolocated Surface Elevation Product
 
+OPTIONS:
+    SUBSETTER: subset dataset to specific indices
+    OUTPUT: output data format
+        dictionary: python dictionary of variables (default)
+        structured: python dictionary with the numpy structured array of
+            file variables (data), J2000 seconds (J2000) and the LVIS Data
+            Structure version (LDS_VERSION)
+
 OUTPUTS LDSv1.04:
     LVIS_LFID:        LVIS file identification, including date and time of
         collection and file number. The second through sixth values in the
@@ -80,84 +88,128 @@ PYTHON DEPENDENCIES:
         https://numpy.org/doc/stable/user/numpy-for-matlab-users.html
 
 UPDATE HISTORY:
+    Updated 10/2026: read data lines with numpy loadtxt as a structured array
+        compile filename regular expression once at module load
+        match the lowercase filename instead of a case-insensitive pattern
+        calculate J2000 seconds in place without temporary arrays
+        use explicit double precision for julian days
+        calculate julian days with integer arithmetic for scalars and arrays
+        add function for reading lists of files with a process pool
+        add option to output variables as a numpy structured array
+        return the version and J2000 seconds with structured arrays
+        stop reading data lines after the last subsetted index
+        remove copy of immutable version string
+        use builtin int for parsing the release version
+        define data types for each LDS version once at module load
+        remove python2 compatibility imports
     Updated 11/2021: use file insensitive case for parsing filenames
     Updated 06/2018: can read and output LVIS LDS version 2.0.2 (2017 campaign+)
     Written 10/2017 for public release
 """
-from __future__ import print_function
-
 import os
 import re
-import copy
+import functools
+import itertools
 import numpy as np
+import concurrent.futures
+
+#-- regular expression pattern for extracting parameters from new format of
+#-- LVIS2 files (format for LDS 1.04 and 2.0+)
+#-- compiled once when the module is loaded and matched to lowercase names
+_FILENAME_RE = re.compile(r'(blvis2|bvlis2|ilvis2|ilvgh2)_(gl|aq)(\d+)_'
+    r'(\d{2})(\d{2})_(r\d+)_(\d+)\.txt$')
+
+#-- input file column types for ascii format LVIS files
+#-- https://lvis.gsfc.nasa.gov/Data/Data_Structure/DataStructure_LDS104.html
+_DTYPE_104 = np.dtype(dict(names=('LVIS_LFID','Shot_Number','Time',
+    'Longitude_Centroid','Latitude_Centroid','Elevation_Centroid',
+    'Longitude_Low','Latitude_Low','Elevation_Low',
+    'Longitude_High','Latitude_High','Elevation_High'),
+    formats=('i','i','f','f','f','f','f','f','f','f','f','f')))
+#-- https://lvis.gsfc.nasa.gov/Data/Data_Structure/DataStructure_LDS202.html
+_DTYPE_202 = np.dtype(dict(names=('LVIS_LFID','Shot_Number','Time',
+    'Longitude_Low','Latitude_Low','Elevation_Low',
+    'Longitude_Top','Latitude_Top','Elevation_Top',
+    'Longitude_High','Latitude_High','Elevation_High',
+    'RH10','RH15','RH20','RH25','RH30','RH35','RH40','RH45','RH50',
+    'RH55','RH60','RH65','RH70','RH75','RH80','RH85','RH90','RH95',
+    'RH96','RH97','RH98','RH99','RH100','Azimuth','Incident_Angle',
+    'Range','Complexity','Flag1','Flag2','Flag3'),
+    formats=('i','i','f','f','f','f','f','f','f','f','f','f','f','f','f',
+    'f','f','f','f','f','f','f','f','f','f','f','f','f','f','f','f','f',
+    'f','f','f','f','f','f','f','i','i','i')))
 
 #-- PURPOSE: read the LVIS Level-2 data file for variables of interest
-def read_LVIS2_elevation(input_file, SUBSETTER=None):
-    #-- regular expression pattern for extracting parameters from new format of
-    #-- LVIS2 files (format for LDS 1.04 and 2.0+)
-    regex_pattern = ('(BLVIS2|BVLIS2|ILVIS2|ILVGH2)_(GL|AQ)(\d+)_(\d{2})(\d{2})'
-        '_(R\d+)_(\d+).TXT$')
+def read_LVIS2_elevation(input_file, SUBSETTER=None, OUTPUT='dictionary'):
     #-- extract mission, region and other parameters from filename
-    MISSION,REGION,YY,MM,DD,RLD,SS=re.findall(regex_pattern,input_file,re.I).pop()
-    LDS_VERSION = '2.0.2' if (np.int(RLD[1:3]) >= 18) else '1.04'
-    #-- input file column types for ascii format LVIS files
-    #-- https://lvis.gsfc.nasa.gov/Data/Data_Structure/DataStructure_LDS104.html
-    #-- https://lvis.gsfc.nasa.gov/Data/Data_Structure/DataStructure_LDS202.html
-    if (LDS_VERSION == '1.04'):
-        file_dtype = {}
-        file_dtype['names'] = ('LVIS_LFID','Shot_Number','Time',
-            'Longitude_Centroid','Latitude_Centroid','Elevation_Centroid',
-            'Longitude_Low','Latitude_Low','Elevation_Low',
-            'Longitude_High','Latitude_High','Elevation_High')
-        file_dtype['formats']=('i','i','f','f','f','f','f','f','f','f','f','f')
-    elif (LDS_VERSION == '2.0.2'):
-        file_dtype = {}
-        file_dtype['names'] = ('LVIS_LFID','Shot_Number','Time',
-            'Longitude_Low','Latitude_Low','Elevation_Low',
-            'Longitude_Top','Latitude_Top','Elevation_Top',
-            'Longitude_High','Latitude_High','Elevation_High',
-            'RH10','RH15','RH20','RH25','RH30','RH35','RH40','RH45','RH50',
-            'RH55','RH60','RH65','RH70','RH75','RH80','RH85','RH90','RH95',
-            'RH96','RH97','RH98','RH99','RH100','Azimuth','Incident_Angle',
-            'Range','Complexity','Flag1','Flag2','Flag3')
-        file_dtype['formats'] = ('i','i','f','f','f','f','f','f','f','f','f',
-            'f','f','f','f','f','f','f','f','f','f','f','f','f','f','f','f','f',
-            'f','f','f','f','f','f','f','f','f','f','f','i','i','i')
-    #-- read icebridge LVIS dataset
-    with open(input_file,'r') as f:
-        file_contents=[i for i in f.read().splitlines() if re.match('^(?!#)',i)]
-    #-- compile regular expression operator for reading lines (extracts numbers)
-    rx = re.compile( '[-+]?(?:(?:\d*\.\d+)|(?:\d+\.?))(?:[Ee][+-]?\d+)?')
+    filename = os.path.basename(input_file).lower()
+    MISSION,REGION,YY,MM,DD,RLD,SS = _FILENAME_RE.search(filename).groups()
+    LDS_VERSION = '2.0.2' if (int(RLD[1:3]) >= 18) else '1.04'
+    #-- structured data type for ascii format LVIS files
+    dt = _DTYPE_202 if (LDS_VERSION == '2.0.2') else _DTYPE_104
+    #-- read icebridge LVIS dataset as a structured array
+    if SUBSETTER and (np.min(SUBSETTER) >= 0):
+        #-- only parse data lines up to the last index if subsetting
+        max_rows = np.max(SUBSETTER) + 1
+        with open(input_file, 'r') as f:
+            #-- skip blank lines and comments in the same way as loadtxt
+            data_lines = (line for line in f if line.strip() and
+                not line.lstrip().startswith('#'))
+            file_contents = np.loadtxt(itertools.islice(data_lines,max_rows),
+                dtype=dt, comments='#', ndmin=1)
+    else:
+        file_contents = np.loadtxt(input_file, dtype=dt, comments='#',
+            ndmin=1)
     #-- subset the data to indices if specified
     if SUBSETTER:
-        file_contents = [file_contents[i] for i in SUBSETTER]
-    #-- output python dictionary with variables
-    LVIS_L2_input = {}
-    #-- create output variables with length equal to the number of file lines
-    for key,val in zip(file_dtype['names'],file_dtype['formats']):
-        LVIS_L2_input[key] = np.zeros_like(file_contents, dtype=val)
-    #-- for each line within the file
-    for line_number,line_entries in enumerate(file_contents):
-        #-- find numerical instances within the line
-        line_contents = rx.findall(line_entries)
-        #-- for each variable of interest: save to dinput as float
-        for i,key in enumerate(file_dtype['names']):
-            LVIS_L2_input[key][line_number] = line_contents[i]
+        file_contents = file_contents[SUBSETTER]
     #-- calculation of julian day (not including hours, minutes and seconds)
-    year,month,day = np.array([YY,MM,DD], dtype=np.float)
-    JD = calc_julian_day(year,month,day)
+    JD = calc_julian_day(float(YY),float(MM),float(DD))
     #-- converting to J2000 seconds and adding seconds since start of day
-    LVIS_L2_input['J2000'] = (JD - 2451545.0)*86400.0 + LVIS_L2_input['Time']
+    #-- (single double precision copy of time updated in place)
+    J2000 = file_contents['Time'].astype(np.float64)
+    J2000 += (JD - 2451545.0)*86400.0
+    #-- return the structured array of variables with J2000 and the version
+    if (OUTPUT == 'structured'):
+        return {'data':file_contents, 'J2000':J2000, 'LDS_VERSION':LDS_VERSION}
+    #-- output python dictionary with variables
+    LVIS_L2_input = {}
+    for key in dt.names:
+        LVIS_L2_input[key] = np.ascontiguousarray(file_contents[key])
+    LVIS_L2_input['J2000'] = J2000
     #-- save LVIS version
-    LVIS_L2_input['LDS_VERSION'] = copy.copy(LDS_VERSION)
+    LVIS_L2_input['LDS_VERSION'] = LDS_VERSION
     #-- return the output variables
     return LVIS_L2_input
 
+#-- PURPOSE: read a list of LVIS Level-2 data files in parallel
+#-- each file is parsed in a separate process
+def read_LVIS2_elevation_batch(input_files, SUBSETTER=None,
+    OUTPUT='dictionary', PROCESSES=None):
+    #-- read each file with a pool of worker processes
+    #-- outputs are returned in the same order as the input files
+    reader = functools.partial(read_LVIS2_elevation, SUBSETTER=SUBSETTER,
+        OUTPUT=OUTPUT)
+    with concurrent.futures.ProcessPoolExecutor(max_workers=PROCESSES) as e:
+        return list(e.map(reader, input_files))
+
 #-- PURPOSE: calculate the Julian day from calendar date
-#-- http://scienceworld.wolfram.com/astronomy/JulianDate.html
+#-- integer day number from Fliegel and Van Flandern (1968)
+#-- scalar calendar dates are computed with python integers
+#-- and arrays of dates with 64-bit integers
 def calc_julian_day(YEAR, MONTH, DAY, HOUR=0, MINUTE=0, SECOND=0):
-    JD = 367.*YEAR - np.floor(7.*(YEAR + np.floor((MONTH+9.)/12.))/4.) - \
-        np.floor(3.*(np.floor((YEAR + (MONTH - 9.)/7.)/100.) + 1.)/4.) + \
-        np.floor(275.*MONTH/9.) + DAY + 1721028.5 + HOUR/24. + MINUTE/1440. + \
-        SECOND/86400.
-    return np.array(JD,dtype=np.float)
+    if np.isscalar(YEAR) and np.isscalar(MONTH):
+        YEAR, MONTH = int(YEAR), int(MONTH)
+    else:
+        YEAR = np.asarray(YEAR, dtype=np.int64)
+        MONTH = np.asarray(MONTH, dtype=np.int64)
+    #-- count years and months from March (leap days at the end of years)
+    a = (14 - MONTH)//12
+    Y = YEAR + 4800 - a
+    M = MONTH + 12*a - 3
+    #-- Julian day number of the day before the first of the month
+    JDN = (153*M + 2)//5 + 365*Y + Y//4 - Y//100 + Y//400 - 32045
+    #-- add the (fractional) day of the month and the time of day
+    #-- with Julian days starting at noon
+    JD = JDN + DAY - 0.5 + HOUR/24. + MINUTE/1440. + SECOND/86400.
+    return JD
@@ -1,14 +1,20 @@
 #!/usr/bin/env python
 u"""
 utilities.py
-Written by Tyler Sutterley (10/2021)
+Written by Tyler Sutterley (10/2026)
 Download and management utilities for syncing time and auxiliary files
 
 PYTHON DEPENDENCIES:
     lxml: processing XML and HTML in Python
         https://pypi.python.org/pypi/lxml
+    requests: HTTP library for Python
+        https://requests.readthedocs.io/
 
 UPDATE HISTORY:
+    Updated 10/2026: iteratively parse NSIDC directory listings
+        deprecate the parser keyword of nsidc_list
+        add requests session with persistent connections for NSIDC
+        remove python2 compatibility imports
     Updated 10/2021: using python logging for handling verbose output
         add parser for converting file lines to arguments
     Updated 08/2021: NSIDC no longer requires authentication headers
@@ -26,8 +32,6 @@ UPDATE HISTORY:
     Updated 08/2020: add Earthdata opener, login and download functions
     Written 08/2020
 """
-from __future__ import print_function
-
 import sys
 import os
 import re
@@ -44,14 +48,12 @@ import logging
 import posixpath
 import lxml.etree
 import calendar,time
-if sys.version_info[0] == 2:
-    from cookielib import CookieJar
-    from urllib import urlencode
-    import urllib2
-else:
-    from http.cookiejar import CookieJar
-    from urllib.parse import urlencode
-    import urllib.request as urllib2
+import requests
+import requests.adapters
+import urllib3.util.retry
+from http.cookiejar import CookieJar
+from urllib.parse import urlencode
+import urllib.request as urllib2
 
 def get_data_path(relpath):
     """
@@ -243,25 +245,84 @@ def build_opener(username, password, context=ssl.SSLContext(),
     #-- HTTPPasswordMgrWithDefaultRealm will be confused.
     return opener
 
+#-- PURPOSE: requests session that keeps credentials for Earthdata redirects
+class EarthdataSession(requests.Session):
+    """
+    requests session that retains the authorization header when redirected
+    to and from the NASA Earthdata login host
+    """
+    def __init__(self, urs='urs.earthdata.nasa.gov'):
+        super(EarthdataSession, self).__init__()
+        self.urs = urs
+
+    def rebuild_auth(self, prepared_request, response):
+        #-- only strip the authorization header when redirected to a
+        #-- different host that is not the Earthdata login host
+        headers = prepared_request.headers
+        if 'Authorization' in headers:
+            original = requests.utils.urlparse(response.request.url).hostname
+            redirect = requests.utils.urlparse(prepared_request.url).hostname
+            if (original != redirect) and (self.urs not in (original,redirect)):
+                del headers['Authorization']
+
+#-- PURPOSE: "login" to NASA Earthdata with a persistent requests session
+def build_session(username=None, password=None, retries=5,
+    pool_connections=4, pool_maxsize=16, urs='urs.earthdata.nasa.gov'):
+    """
+    build requests session for NASA Earthdata with supplied credentials
+    that reuses connections to each host (HTTP keep-alive)
+
+    Keyword arguments
+    -----------------
+    username: NASA Earthdata username
+    password: NASA Earthdata password
+    retries: number of retries for failed connections
+    pool_connections: number of host connection pools to cache
+    pool_maxsize: maximum number of connections to save in each pool
+    urs: Earthdata login URS 3 host
+    """
+    #-- use netrc credentials
+    if not (username or password):
+        username,login,password = netrc.netrc().authenticators(urs)
+    #-- create session with basic authentication for Earthdata
+    session = EarthdataSession(urs=urs)
+    session.auth = (username, password)
+    #-- retry failed connections with an exponential backoff
+    retry = urllib3.util.retry.Retry(total=retries, backoff_factor=0.5,
+        status_forcelist=(500,502,503,504))
+    adapter = requests.adapters.HTTPAdapter(max_retries=retry,
+        pool_connections=pool_connections, pool_maxsize=pool_maxsize)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
 #-- PURPOSE: check that entered NASA Earthdata credentials are valid
-def check_credentials():
+def check_credentials(session=None):
     """
     Check that entered NASA Earthdata credentials are valid
+
+    Keyword arguments
+    -----------------
+    session: requests session for NASA Earthdata
     """
     try:
         remote_path = posixpath.join('https://n5eil01u.ecs.nsidc.org','ATLAS')
-        request = urllib2.Request(url=remote_path)
-        response = urllib2.urlopen(request, timeout=20)
-    except urllib2.HTTPError:
+        if session is not None:
+            response = session.get(remote_path, timeout=20)
+            response.raise_for_status()
+        else:
+            request = urllib2.Request(url=remote_path)
+            response = urllib2.urlopen(request, timeout=20)
+    except (urllib2.HTTPError, requests.exceptions.HTTPError):
         raise RuntimeError('Check your NASA Earthdata credentials')
-    except urllib2.URLError:
+    except (urllib2.URLError, requests.exceptions.RequestException):
         raise RuntimeError('Check internet connection')
     else:
         return True
 
 #-- PURPOSE: list a directory on NSIDC https server
 def nsidc_list(HOST,username=None,password=None,build=True,timeout=None,
-    parser=lxml.etree.HTMLParser(),pattern='',sort=False):
+    parser=None,pattern='',sort=False,session=None):
     """
     List a directory on NSIDC
 
@@ -275,9 +336,10 @@ def nsidc_list(HOST,username=None,password=None,build=True,timeout=None,
     password: NASA Earthdata password
     build: Build opener and check NASA Earthdata credentials
     timeout: timeout in seconds for blocking operations
-    parser: HTML parser for lxml
+    parser: HTML parser for lxml (deprecated and ignored)
     pattern: regular expression pattern for reducing list
     sort: sort output list
+    session: requests session to use in place of a urllib2 opener
 
     Returns
     -------
@@ -290,7 +352,7 @@ def nsidc_list(HOST,username=None,password=None,build=True,timeout=None,
         urs = 'urs.earthdata.nasa.gov'
         username,login,password = netrc.netrc().authenticators(urs)
     #-- build urllib2 opener and check credentials
-    if build:
+    if build and session is None:
         #-- build urllib2 opener with credentials
         build_opener(username, password)
         #-- check credentials
@@ -298,17 +360,22 @@ def nsidc_list(HOST,username=None,password=None,build=True,timeout=None,
     #-- try listing from https
     try:
         #-- Create and submit request.
-        request = urllib2.Request(posixpath.join(*HOST))
-        tree = lxml.etree.parse(urllib2.urlopen(request,timeout=timeout),parser)
-    except (urllib2.HTTPError, urllib2.URLError):
+        if session is not None:
+            response = session.get(posixpath.join(*HOST), timeout=timeout,
+                stream=True)
+            response.raise_for_status()
+            response.raw.decode_content = True
+            response = response.raw
+        else:
+            request = urllib2.Request(posixpath.join(*HOST))
+            response = urllib2.urlopen(request,timeout=timeout)
+    except (urllib2.HTTPError, urllib2.URLError,
+        requests.exceptions.RequestException):
         colerror = 'List error from {0}'.format(posixpath.join(*HOST))
         return (False,False,colerror)
     else:
         #-- read and parse request for files (column names and modified times)
-        colnames = tree.xpath('//td[@class="indexcolname"]//a/@href')
-        #-- get the Unix timestamp value for a modification time
-        collastmod = [get_unix_time(i,format='%Y-%m-%d %H:%M')
-            for i in tree.xpath('//td[@class="indexcollastmod"]/text()')]
+        colnames,collastmod = parse_index(response)
         #-- reduce using regular expression pattern
         if pattern:
             i = [i for i,f in enumerate(colnames) if re.search(pattern,f)]
@@ -324,6 +391,37 @@ def nsidc_list(HOST,username=None,password=None,build=True,timeout=None,
         #-- return the list of column names and last modified times
         return (colnames,collastmod,None)
 
+#-- PURPOSE: parse column names and modification times from an index page
+def parse_index(fid):
+    """
+    Iteratively parse the table cells of an NSIDC directory index
+
+    Arguments
+    ---------
+    fid: open file object of the html index page
+
+    Returns
+    -------
+    colnames: list of column names in a directory
+    collastmod: list of last modification times for items in the directory
+    """
+    colnames = []
+    collastmod = []
+    #-- only build the table cells and clear each cell after reading
+    for event,element in lxml.etree.iterparse(fid, events=('end',),
+        tag='td', html=True):
+        if (element.get('class') == 'indexcolname'):
+            colnames.extend(element.xpath('.//a/@href'))
+        elif (element.get('class') == 'indexcollastmod') and element.text:
+            #-- get the Unix timestamp value for a modification time
+            collastmod.append(get_unix_time(element.text,
+                format='%Y-%m-%d %H:%M'))
+        #-- free the cell and any previously read cells within the row
+        element.clear()
+        while element.getprevious() is not None:
+            del element.getparent()[0]
+    return (colnames,collastmod)
+
 #-- PURPOSE: download a file from a NSIDC https server
 def from_nsidc(HOST,username=None,password=None,build=True,timeout=None,
     local=None,hash='',chunk=16384,verbose=False,fid=sys.stdout,mode=0o775):
@@ -1,7 +1,7 @@
 #!/usr/bin/env python
 u"""
 nsidc_convert_ILVIS2.py
-Written by Tyler Sutterley (11/2021)
+Written by Tyler Sutterley (10/2026)
 
 Reads IceBridge Geolocated LVIS Elevation Product datafiles directly
     from NSIDC server as bytes and outputs as HDF5 files
@@ -27,121 +27,288 @@ COMMAND LINE OPTIONS:
     -S X, --subdirectory X: specific subdirectories to sync
     -U X, --user X: username for NASA Earthdata Login
     -D X, --directory: working data directory
-    -V, --verbose: Verbose output of files synced
     -C, --clobber: Overwrite existing data in transfer
+    -c X, --compression X: Compression filter for output HDF5 datasets
+        gzip
+        lzf
+        bitshuffle (requires hdf5plugin)
+        lz4 (requires hdf5plugin)
+        zstd (requires hdf5plugin)
     -M X, --mode X: Local permissions mode of the directories and files synced
+    -T X, --threads X: Number of threads to use in file downloads
+    -P X, --processes X: Number of processes to use in reading and converting
+        files (default uses threads in the main process)
 
 PYTHON DEPENDENCIES:
     numpy: Scientific Computing Tools For Python
         https://numpy.org
     h5py: Python interface for Hierarchal Data Format 5 (HDF5)
         https://www.h5py.org/
+    hdf5plugin: Additional compression filters for h5py (optional)
+        https://github.com/silx-kit/hdf5plugin
     lxml: Pythonic XML and HTML processing library using libxml2/libxslt
         https://lxml.de/
         https://github.com/lxml/lxml
-    future: Compatibility layer between Python 2 and Python 3
-        http://python-future.org/
+    requests: HTTP library for Python
+        https://requests.readthedocs.io/
 
 UPDATE HISTORY:
+    Updated 10/2026: use the HDF5 writer and LVIS reader from the package
+        stream remote files into the ascii parser with a requests session
+        sync files within each subdirectory using a pool of threads
+        add option to read and convert files with a pool of processes
+        add options for lzf, gzip and hdf5plugin compression filters
+        scan local directories once to skip up-to-date files
+        fix url of remote files with posixpath join
+        remove python2 compatibility imports
     Updated 11/2021: use argparse for command line options
     Updated 10/2021: using python logging for handling verbose output
     Updated 12/2018: decode authorization header for python3 compatibility
     Updated 11/2018: encode base64 strings for python3 compatibility
     Updated 07/2018 for public release
 """
-from __future__ import print_function
-
 import sys
 import os
 import re
-import h5py
 import netrc
 import shutil
 import getpass
+import functools
 import logging
+import queue
 import argparse
-import builtins
+import importlib.util
+import concurrent.futures
 import posixpath
 import numpy as np
 import calendar, time
+import read_LVIS2_elevation
 import read_LVIS2_elevation.utilities
-import read_LVIS2_elevation.convert_julian
+from read_LVIS2_elevation.read_LVIS2_elevation import (calc_julian_day,
+    _DTYPE_104, _DTYPE_202)
+
+#-- regular expression operator for file prefixes of product
+_REMOTE_FILE_RE = re.compile(r'(ILVIS2)_(GL|AQ)(\d+)_(\d+)_(R\d+)_(\d+)\.TXT')
+#-- regular expression operator for extracting parameters from new format of
+#-- LVIS2 files (format for LDS 1.04 and 2.0+)
+_FNAME_RE = re.compile(r'(ILVIS2)_(GL|AQ)(\d+)_(\d{2})(\d{2})'
+    r'_(R\d+)_(\d+)\.TXT$')
 
 #-- PURPOSE: sync the Icebridge LVIS elevation data from NSIDC
-def nsidc_convert_ILVIS2(DIRECTORY, YEARS=None, SUBDIRECTORY=None,
+def nsidc_convert_ILVIS2(DIRECTORY, SESSION=None, YEARS=None,
+    SUBDIRECTORY=None, THREADS=8, PROCESSES=0, COMPRESSION='lzf',
     CLOBBER=False, MODE=0o775):
     #-- standard output (terminal output)
     logging.basicConfig(level=logging.INFO)
+    #-- build a requests session for NSIDC using netrc credentials
+    #-- with a connection for each download thread
+    if SESSION is None:
+        SESSION = read_LVIS2_elevation.utilities.build_session(
+            pool_maxsize=THREADS)
     #-- Land, Vegetation and Ice Sensor Surface Elevation Product (Level-2)
     #-- remote directories for dataset on NSIDC server
     remote_directories = ["ICEBRIDGE","ILVIS2.001"]
-    #-- regular expression for file prefixes of product
-    remote_regex_pattern = '(ILVIS2)_(GL|AQ)(\d+)_(\d+)_(R\d+)_(\d+).TXT'
 
     #-- remote https server for Icebridge Data
     HOST = 'https://n5eil01u.ecs.nsidc.org'
     #-- regular expression operator for finding icebridge-style subdirectories
-    if SUBDIRECTORY:
-        #-- Sync particular subdirectories for product
-        R2 = re.compile('('+'|'.join(SUBDIRECTORY)+')', re.VERBOSE)
-    elif YEARS:
-        #-- Sync particular years for product
-        regex_pattern = '|'.join('{0:d}'.format(y) for y in YEARS)
-        R2 = re.compile('({0}).(\d+).(\d+)'.format(regex_pattern), re.VERBOSE)
-    else:
-        #-- Sync all available years for product
-        R2 = re.compile('(\d+).(\d+).(\d+)', re.VERBOSE)
-    #-- compile regular expression operator for extracting modification date
-    date_regex_pattern = '(\d+)\-(\d+)\-(\d+)\s(\d+)\:(\d+)'
-    R3 = re.compile(date_regex_pattern, re.VERBOSE)
+    R2 = subdirectory_regex(tuple(SUBDIRECTORY or ()), tuple(YEARS or ()))
 
     #-- get subdirectories from remote directory
     remote_sub,_,error = read_LVIS2_elevation.utilities.nsidc_list(
         [HOST,remote_directories[0],remote_directories[1]],
-        pattern=R2,sort=True)
+        build=False,session=SESSION,pattern=R2,sort=True)
     #-- print if subdirectory was not found
     if not remote_sub:
         logging.critical(error)
         return
-    #-- for each remote subdirectory
-    for sd in remote_sub:
-        #-- check if data directory exists and recursively create if not
-        local_dir = os.path.join(DIRECTORY,sd)
-        os.makedirs(local_dir,MODE) if not os.path.exists(local_dir) else None
-        #-- find Icebridge data files
-        colnames,collastmod,error = read_LVIS2_elevation.utilities.nsidc_list(
-            [HOST,remote_directories[0],remote_directories[1],sd],
-            pattern=remote_regex_pattern, sort=True)
-        #-- print if file was not found
-        if not colnames:
-            logging.critical(error)
-            continue
-        #-- sync each Icebridge data file
-        for colname,remote_mtime in zip(colnames,collastmod):
-            #-- remote and local versions of the file
-            remote_file = posixpath.join([HOST,remote_directories[0],
-                remote_directories[1],sd,colname])
-            local_file = os.path.join(local_dir,colname)
-            http_pull_file(remote_file, remote_mtime, local_file,
-                CLOBBER=CLOBBER, MODE=MODE)
+    #-- pool of processes for reading and converting files in parallel
+    #-- each worker process builds a session with the same credentials
+    if PROCESSES:
+        #-- share the available processors between the worker processes
+        #-- when compressing chunks with threads
+        THREADS_PER_PROCESS = max(1, (os.cpu_count() or 1)//PROCESSES)
+        executor = concurrent.futures.ProcessPoolExecutor(
+            max_workers=PROCESSES, initializer=init_worker,
+            initargs=(SESSION.auth,))
+    try:
+        #-- for each remote subdirectory
+        for sd in remote_sub:
+            #-- check if data directory exists and recursively create if not
+            local_dir = os.path.join(DIRECTORY,sd)
+            if not os.path.exists(local_dir):
+                os.makedirs(local_dir,MODE)
+            #-- find Icebridge data files
+            colnames,collastmod,error = \
+                read_LVIS2_elevation.utilities.nsidc_list(
+                [HOST,remote_directories[0],remote_directories[1],sd],
+                build=False, session=SESSION, pattern=_REMOTE_FILE_RE,
+                sort=True)
+            #-- print if file was not found
+            if not colnames:
+                logging.critical(error)
+                continue
+            #-- status of all local files with a single directory scan
+            local_stats = {e.name:e.stat() for e in os.scandir(local_dir)}
+            #-- remote subdirectory url shared by each file
+            remote_dir = posixpath.join(HOST,*remote_directories,sd)
+            #-- remote and local versions of each file to transfer
+            transfers = []
+            for colname,remote_mtime in zip(colnames,collastmod):
+                remote_file = posixpath.join(remote_dir,colname)
+                local_file = os.path.join(local_dir,colname)
+                #-- cached status of the local (HDF5) version of the file
+                local_stat = local_stats.get(output_filename(colname))
+                #-- skip files without opening a connection or a worker
+                #-- if the local version is up-to-date and not clobbering
+                if not CLOBBER and is_up_to_date(local_stat, remote_mtime):
+                    continue
+                transfers.append((remote_file, remote_mtime, local_file,
+                    local_stat))
+            #-- sync each Icebridge data file using the pool of processes
+            if PROCESSES:
+                futures = [executor.submit(http_convert_file, *transfer[:3],
+                    LOCAL_STAT=transfer[3], COMPRESSION=COMPRESSION,
+                    THREADS=THREADS_PER_PROCESS, CLOBBER=CLOBBER, MODE=MODE)
+                    for transfer in transfers]
+                #-- raise any exceptions from the worker processes
+                #-- cancelling the conversions that have not started
+                try:
+                    for future in futures:
+                        future.result()
+                except BaseException:
+                    for future in futures:
+                        future.cancel()
+                    raise
+                continue
+            #-- bounded queue of parsed files waiting to be output as HDF5
+            output_queue = queue.Queue(maxsize=THREADS)
+            #-- sync each Icebridge data file using a pool of threads
+            futures = []
+            with concurrent.futures.ThreadPoolExecutor(
+                max_workers=THREADS) as e:
+                for *transfer,local_stat in transfers:
+                    futures.append(e.submit(http_pull_file, SESSION, *transfer,
+                        output_queue, LOCAL_STAT=local_stat, CLOBBER=CLOBBER,
+                        MODE=MODE))
+                #-- output HDF5 files while the next files are being downloaded
+                #-- each download thread adds a single item to the queue
+                pending = len(futures)
+                try:
+                    while pending:
+                        item = output_queue.get()
+                        pending -= 1
+                        if item is not None:
+                            output_HDF5_file(*item, COMPRESSION=COMPRESSION,
+                                MODE=MODE)
+                except BaseException:
+                    #-- cancel downloads that have not started and drain the
+                    #-- queue so running downloads are not blocked when adding
+                    pending -= sum(future.cancel() for future in futures)
+                    for _ in range(pending):
+                        output_queue.get()
+                    raise
+            #-- raise any exceptions from the download threads
+            for future in futures:
+                future.result()
+    finally:
+        #-- shutdown the pool of processes (including after errors)
+        if PROCESSES:
+            executor.shutdown()
+
+#-- requests session for NSIDC within each worker process
+_WORKER_SESSION = None
+
+#-- PURPOSE: initialize a worker process with a session and logger
+def init_worker(auth):
+    global _WORKER_SESSION
+    logging.basicConfig(level=logging.INFO)
+    _WORKER_SESSION = read_LVIS2_elevation.utilities.build_session(*auth,
+        pool_maxsize=1)
+
+#-- PURPOSE: pull, read and output a file within a worker process
+def http_convert_file(remote_file, remote_mtime, local_file,
+    LOCAL_STAT=None, COMPRESSION='lzf', THREADS=None, CLOBBER=False,
+    MODE=0o775):
+    item = http_read_file(_WORKER_SESSION, remote_file, remote_mtime,
+        local_file, LOCAL_STAT=LOCAL_STAT, CLOBBER=CLOBBER, MODE=MODE)
+    if item is not None:
+        output_HDF5_file(*item, COMPRESSION=COMPRESSION, THREADS=THREADS,
+            MODE=MODE)
+
+#-- PURPOSE: write parsed data to HDF5 and keep the remote modification time
+def output_HDF5_file(LVIS_L2_input, LDS_VERSION, remote_file, remote_mtime,
+    local_file, COMPRESSION='lzf', THREADS=None, MODE=0o775):
+    read_LVIS2_elevation.HDF5_icebridge_lvis(LVIS_L2_input, LDS_VERSION,
+        FILENAME=local_file, INPUT_FILE=remote_file,
+        COMPRESSION=COMPRESSION, THREADS=THREADS)
+    #-- keep remote modification time of file and local access time
+    local_atime = os.stat(local_file).st_atime
+    os.utime(local_file, (local_atime, remote_mtime))
+    os.chmod(local_file, MODE)
+
+#-- PURPOSE: compile the regular expression operator for finding
+#-- icebridge-style subdirectories (cached for repeated calls)
+@functools.lru_cache(maxsize=32)
+def subdirectory_regex(SUBDIRECTORY=(), YEARS=()):
+    if SUBDIRECTORY:
+        #-- Sync particular subdirectories for product
+        return re.compile(r'({0})'.format('|'.join(SUBDIRECTORY)))
+    elif YEARS:
+        #-- Sync particular years for product
+        regex_pattern = '|'.join('{0:d}'.format(y) for y in YEARS)
+        return re.compile(r'({0}).(\d+).(\d+)'.format(regex_pattern))
+    else:
+        #-- Sync all available years for product
+        return re.compile(r'(\d+).(\d+).(\d+)')
+
+#-- PURPOSE: get the local filename for a remote file
+#-- (Level-2 files are output as HDF5)
+def output_filename(local_file):
+    fileBasename, fileExtension = os.path.splitext(local_file)
+    if (fileExtension == '.TXT'):
+        local_file = '{0}.H5'.format(fileBasename)
+    return local_file
+
+#-- PURPOSE: check if the local version of a file exists and is at least
+#-- as new as the remote file using the cached status of the local file
+def is_up_to_date(local_stat, remote_mtime):
+    if local_stat is None:
+        return False
+    return (remote_mtime <= local_stat.st_mtime)
 
 #-- PURPOSE: pull file from a remote host checking if file exists locally
 #-- and if the remote file is newer than the local file
-#-- read the input file and output as HDF5
-def http_pull_file(remote_file, remote_mtime, local_file,
-    CLOBBER=False, MODE=0o775):
+#-- read the input file and add to the queue for output as HDF5
+def http_pull_file(session, remote_file, remote_mtime, local_file,
+    output_queue, LOCAL_STAT=None, CLOBBER=False, MODE=0o775):
+    #-- parsed data to be output as HDF5 (None if there is nothing to output)
+    item = None
+    try:
+        item = http_read_file(session, remote_file, remote_mtime, local_file,
+            LOCAL_STAT=LOCAL_STAT, CLOBBER=CLOBBER, MODE=MODE)
+    finally:
+        #-- always add an item so the HDF5 writer is never left waiting
+        output_queue.put(item)
+
+#-- PURPOSE: pull file from a remote host checking if file exists locally
+#-- and if the remote file is newer than the local file
+def http_read_file(session, remote_file, remote_mtime, local_file,
+    LOCAL_STAT=None, CLOBBER=False, MODE=0o775):
     #-- split extension from input LVIS data file
     fileBasename, fileExtension = os.path.splitext(local_file)
     #-- copy Level-2 file from server into new HDF5 file
-    if (fileExtension == '.TXT'):
-        local_file = '{0}.H5'.format(fileBasename)
+    local_file = output_filename(local_file)
     #-- if file exists in file system: check if remote file is newer
     TEST = False
     OVERWRITE = ' (clobber)'
+    #-- check status of local file if not cached from the directory scan
+    if LOCAL_STAT is None and os.access(local_file, os.F_OK):
+        LOCAL_STAT = os.stat(local_file)
     #-- check if local version of file exists
-    if os.access(local_file, os.F_OK):
+    if LOCAL_STAT is not None:
         #-- check last modification time of local file
-        local_mtime = os.stat(local_file).st_mtime
+        local_mtime = LOCAL_STAT.st_mtime
         #-- if remote file is newer: overwrite the local file
         if (remote_mtime > local_mtime):
             TEST = True
@@ -156,394 +323,56 @@ def http_pull_file(remote_file, remote_mtime, local_file,
         logging.info('\t{0}{1}\n'.format(local_file,OVERWRITE))
         #-- Download xml files using shutil chunked transfer encoding
         if (fileExtension == '.xml'):
-            #-- Create and submit request. There are a wide range of exceptions
-            #-- that can be thrown here, including HTTPError and URLError.
-            request = read_LVIS2_elevation.utilities.urllib2.Request(remote_file)
-            response = read_LVIS2_elevation.utilities.urllib2.urlopen(request)
             #-- chunked transfer encoding size
-            CHUNK = 16 * 1024
-            #-- copy contents to local file using chunked transfer encoding
-            #-- transfer should work properly with ascii and binary data formats
-            with open(local_file, 'wb') as f:
-                shutil.copyfileobj(response, f, CHUNK)
+            CHUNK = 1024 * 1024
+            #-- Create and submit request using the persistent session
+            #-- connection is returned to the pool when the response closes
+            with session.get(remote_file, stream=True) as response:
+                response.raise_for_status()
+                response.raw.decode_content = True
+                #-- copy contents to local file using chunked transfer encoding
+                #-- transfer should work with ascii and binary data formats
+                with open(local_file, 'wb') as f:
+                    shutil.copyfileobj(response.raw, f, CHUNK)
+            #-- keep remote modification time of file and local access time
+            os.utime(local_file, (os.stat(local_file).st_atime, remote_mtime))
+            os.chmod(local_file, MODE)
         else:
-            #-- read input data
-            LVIS_L2_input,LDS_VERSION = read_LVIS_file(remote_file)
-            HDF5_icebridge_lvis(LVIS_L2_input, LDS_VERSION, FILENAME=local_file,
-                INPUT_FILE=remote_file)
-        #-- keep remote modification time of file and local access time
-        os.utime(local_file, (os.stat(local_file).st_atime, remote_mtime))
-        os.chmod(local_file, MODE)
+            #-- read input data and return for output as HDF5
+            LVIS_L2_input,LDS_VERSION = read_LVIS_file(remote_file, session)
+            return (LVIS_L2_input, LDS_VERSION,
+                remote_file, remote_mtime, local_file)
 
 #-- PURPOSE: read the LVIS Level-2 data file for variables of interest
-def read_LVIS_file(remote_file):
-    #-- regular expression pattern for extracting parameters from new format of
-    #-- LVIS2 files (format for LDS 1.04 and 2.0+)
-    regex_pattern = '(ILVIS2)_(GL|AQ)(\d+)_(\d{2})(\d{2})_(R\d+)_(\d+).TXT$'
+def read_LVIS_file(remote_file, session):
     #-- extract mission, region and other parameters from filename
-    MISSION,REGION,YY,MM,DD,RLD,SS = re.findall(regex_pattern,remote_file).pop()
-    LDS_VERSION = '2.0.2' if (np.int(RLD[1:3]) >= 18) else '1.04'
-
-    #-- input file column types for ascii format LVIS files
-    #-- https://lvis.gsfc.nasa.gov/Data/Data_Structure/DataStructure_LDS104.html
-    #-- https://lvis.gsfc.nasa.gov/Data/Data_Structure/DataStructure_LDS202.html
-    if (LDS_VERSION == '1.04'):
-        file_dtype = {}
-        file_dtype['names'] = ('LVIS_LFID','Shot_Number','Time',
-            'Longitude_Centroid','Latitude_Centroid','Elevation_Centroid',
-            'Longitude_Low','Latitude_Low','Elevation_Low',
-            'Longitude_High','Latitude_High','Elevation_High')
-        file_dtype['formats']=('i','i','f','f','f','f','f','f','f','f','f','f')
-    elif (LDS_VERSION == '2.0.2'):
-        file_dtype = {}
-        file_dtype['names'] = ('LVIS_LFID','Shot_Number','Time',
-            'Longitude_Low','Latitude_Low','Elevation_Low',
-            'Longitude_Top','Latitude_Top','Elevation_Top',
-            'Longitude_High','Latitude_High','Elevation_High',
-            'RH10','RH15','RH20','RH25','RH30','RH35','RH40','RH45','RH50',
-            'RH55','RH60','RH65','RH70','RH75','RH80','RH85','RH90','RH95',
-            'RH96','RH97','RH98','RH99','RH100','Azimuth','Incident_Angle',
-            'Range','Complexity','Flag1','Flag2','Flag3')
-        file_dtype['formats'] = ('i','i','f','f','f','f','f','f','f','f','f',
-            'f','f','f','f','f','f','f','f','f','f','f','f','f','f','f','f','f',
-            'f','f','f','f','f','f','f','f','f','f','f','i','i','i')
-
-    #-- Create and submit request. There are a wide range of exceptions
-    #-- that can be thrown here, including HTTPError and URLError.
-    request = read_LVIS2_elevation.utilities.urllib2.Request(remote_file)
-    f = read_LVIS2_elevation.utilities.urllib2.urlopen(request)
-    #-- read icebridge LVIS dataset
-    file_contents = [i for i in f.read().splitlines() if re.match('^(?!#)',i)]
-    #-- compile regular expression operator for reading lines (extracts numbers)
-    rx = re.compile('[-+]?(?:(?:\d*\.\d+)|(?:\d+\.?))(?:[Ee][+-]?\d+)?')
+    MISSION,REGION,YY,MM,DD,RLD,SS = _FNAME_RE.search(remote_file).groups()
+    LDS_VERSION = '2.0.2' if (int(RLD[1:3]) >= 18) else '1.04'
+
+    #-- structured data type for ascii format LVIS files
+    dt = _DTYPE_202 if (LDS_VERSION == '2.0.2') else _DTYPE_104
+    #-- Create and submit request using the persistent session
+    #-- connection is returned to the pool when the response closes
+    with session.get(remote_file, stream=True) as response:
+        response.raise_for_status()
+        response.raw.decode_content = True
+        #-- read icebridge LVIS dataset as a structured array
+        #-- parse directly from the response stream without buffering
+        file_contents = np.loadtxt(response.raw, dtype=dt, comments='#',
+            ndmin=1)
     #-- output python dictionary with variables
     LVIS_L2_input = {}
-    #-- create output variables with length equal to the number of file lines
-    for key,val in zip(file_dtype['names'],file_dtype['formats']):
-        LVIS_L2_input[key] = np.zeros_like(file_contents, dtype=val)
-    #-- for each line within the file
-    for line_number,line_entries in enumerate(file_contents):
-        #-- find numerical instances within the line
-        line_contents = rx.findall(line_entries)
-        #-- for each variable of interest: save to dinput as float
-        for i,key in enumerate(file_dtype['names']):
-            val = np.array(line_contents[i], dtype=file_dtype['formats'][i])
-            LVIS_L2_input[key][line_number] = val
+    for key in dt.names:
+        LVIS_L2_input[key] = np.ascontiguousarray(file_contents[key])
     #-- calculation of julian day (not including hours, minutes and seconds)
-    year,month,day = np.array([YY,MM,DD],dtype=np.float)
-    JD = calc_julian_day(year,month,day)
+    JD = calc_julian_day(float(YY),float(MM),float(DD))
     #-- converting to J2000 seconds and adding seconds since start of day
-    LVIS_L2_input['J2000'] = (JD - 2451545.0)*86400.0 + LVIS_L2_input['Time']
+    #-- (calculated in double precision)
+    LVIS_L2_input['J2000'] = (JD - 2451545.0)*86400.0 + \
+        LVIS_L2_input['Time'].astype(np.float64)
     #-- return the output variables
     return (LVIS_L2_input, LDS_VERSION)
 
-#-- PURPOSE: calculate the Julian day from calendar date
-#-- http://scienceworld.wolfram.com/astronomy/JulianDate.html
-def calc_julian_day(YEAR, MONTH, DAY, HOUR=0, MINUTE=0, SECOND=0):
-    JD = 367.*YEAR - np.floor(7.*(YEAR + np.floor((MONTH+9.)/12.))/4.) - \
-        np.floor(3.*(np.floor((YEAR + (MONTH - 9.)/7.)/100.) + 1.)/4.) + \
-        np.floor(275.*MONTH/9.) + DAY + 1721028.5 + HOUR/24. + MINUTE/1440. + \
-        SECOND/86400.
-    return np.array(JD,dtype=np.float)
-
-#-- PURPOSE: output HDF5 file with geolocated elevation surfaces calculated
-#-- from LVIS Level-1b waveform products
-def HDF5_icebridge_lvis(ILVIS2_MDS,LDS_VERSION,FILENAME=None,INPUT_FILE=None):
-    #-- open output HDF5 file
-    fileID = h5py.File(FILENAME, 'w')
-
-    #-- create sub-groups within HDF5 file
-    fileID.create_group('Time')
-    fileID.create_group('Geolocation')
-    fileID.create_group('Elevation_Surfaces')
-    #-- sub-groups specific to the LDS version 2.0.2
-    if (LDS_VERSION == '2.0.2'):
-        fileID.create_group('Waveform')
-        fileID.create_group('Instrument_Parameters')
-
-    #-- Dimensions of parameters
-    n_records, = ILVIS2_MDS['Shot_Number'].shape
-
-    #-- Defining output HDF5 variable attributes
-    attributes = {}
-    #-- LVIS_LFID
-    attributes['LVIS_LFID'] = {}
-    attributes['LVIS_LFID']['long_name'] = 'LVIS Record Index'
-    attributes['LVIS_LFID']['description'] = ('LVIS file identification, '
-        'including date and time of collection and file number. The third '
-        'through seventh values in first field represent the Modified Julian '
-        'Date of data collection.')
-    #-- Shot Number
-    attributes['Shot_Number'] = {}
-    attributes['Shot_Number']['long_name'] = ('Shot Number')
-    attributes['Shot_Number']['description'] = ('Laser shot assigned during '
-        'collection')
-    #-- Time
-    attributes['Time'] = {}
-    attributes['Time']['long_name'] = 'Transmit time of each shot'
-    attributes['Time']['units'] = 'Seconds'
-    attributes['Time']['description'] = 'UTC decimal seconds of the day'
-    #-- J2000
-    attributes['J2000'] = {}
-    attributes['J2000']['long_name'] = ('Transmit time of each shot in J2000 '
-        'seconds')
-    attributes['J2000']['units'] = 'seconds since 2000-01-01 12:00:00 UTC'
-    attributes['J2000']['description'] = ('The transmit time of each shot in '
-        'the 1 second frame measured as UTC seconds elapsed since Jan 1 '
-        '2000 12:00:00 UTC.')
-    #-- Centroid
-    attributes['Longitude_Centroid'] = {}
-    attributes['Longitude_Centroid']['long_name'] = 'Longitude_Centroid'
-    attributes['Longitude_Centroid']['units'] = 'Degrees East'
-    attributes['Longitude_Centroid']['description'] = ('Corresponding longitude '
-        'of the LVIS Level-1B waveform centroid')
-    attributes['Latitude_Centroid'] = {}
-    attributes['Latitude_Centroid']['long_name'] = 'Latitude_Centroid'
-    attributes['Latitude_Centroid']['units'] = 'Degrees North'
-    attributes['Latitude_Centroid']['description'] = ('Corresponding latitude of '
-        'the LVIS Level-1B waveform centroid')
-    attributes['Elevation_Centroid'] = {}
-    attributes['Elevation_Centroid']['long_name'] = 'Elevation_Centroid'
-    attributes['Elevation_Centroid']['units'] = 'Meters'
-    attributes['Elevation_Centroid']['description'] = ('Elevation surface of the '
-        'LVIS Level-1B waveform centroid')
-    #-- Lowest mode
-    attributes['Longitude_Low'] = {}
-    attributes['Longitude_Low']['long_name'] = 'Longitude_Low'
-    attributes['Longitude_Low']['units'] = 'Degrees East'
-    attributes['Longitude_Low']['description'] = ('Longitude of the '
-        'lowest detected mode within the LVIS Level-1B waveform')
-    attributes['Latitude_Low'] = {}
-    attributes['Latitude_Low']['long_name'] = 'Latitude_Low'
-    attributes['Latitude_Low']['units'] = 'Degrees North'
-    attributes['Latitude_Low']['description'] = ('Latitude of the '
-        'lowest detected mode within the LVIS Level-1B waveform')
-    attributes['Elevation_Low'] = {}
-    attributes['Elevation_Low']['long_name'] = 'Elevation_Low'
-    attributes['Elevation_Low']['units'] = 'Meters'
-    attributes['Elevation_Low']['description'] = ('Mean Elevation of the '
-        'lowest detected mode within the LVIS Level-1B waveform')
-    #-- Highest mode
-    attributes['Longitude_High'] = {}
-    attributes['Longitude_High']['long_name'] = 'Longitude_High'
-    attributes['Longitude_High']['units'] = 'Degrees East'
-    attributes['Longitude_High']['description'] = ('Longitude of the '
-        'highest detected mode within the LVIS Level-1B waveform')
-    attributes['Latitude_High'] = {}
-    attributes['Latitude_High']['long_name'] = 'Latitude_High'
-    attributes['Latitude_High']['units'] = 'Degrees North'
-    attributes['Latitude_High']['description'] = ('Latitude of the '
-        'highest detected mode within the LVIS Level-1B waveform')
-    attributes['Elevation_High'] = {}
-    attributes['Elevation_High']['long_name'] = 'Elevation_High'
-    attributes['Elevation_High']['units'] = 'Meters'
-    attributes['Elevation_High']['description'] = ('Mean Elevation of the '
-        'highest detected mode within the LVIS Level-1B waveform')
-    #-- Highest detected signal
-    attributes['Longitude_Top'] = {}
-    attributes['Longitude_Top']['long_name'] = 'Longitude_Top'
-    attributes['Longitude_Top']['units'] = 'Degrees East'
-    attributes['Longitude_Top']['description'] = ('Longitude of the '
-        'highest detected signal within the LVIS Level-1B waveform')
-    attributes['Latitude_Top'] = {}
-    attributes['Latitude_Top']['long_name'] = 'Latitude_Top'
-    attributes['Latitude_Top']['units'] = 'Degrees North'
-    attributes['Latitude_Top']['description'] = ('Latitude of the '
-        'highest detected signal within the LVIS Level-1B waveform')
-    attributes['Elevation_Top'] = {}
-    attributes['Elevation_Top']['long_name'] = 'Elevation_Top'
-    attributes['Elevation_Top']['units'] = 'Meters'
-    attributes['Elevation_Top']['description'] = ('Mean Elevation of the '
-        'highest detected signal within the LVIS Level-1B waveform')
-    #-- heights at which a percentage of the waveform energy occurs
-    pv = [10,15,20,25,30,35,40,45,50,55,60,65,70,75,80,85,90,95,96,97,98,99,100]
-    for RH in pv:
-        attributes['RH{0:d}'.format(RH)] = {}
-        attributes['RH{0:d}'.format(RH)]['long_name'] = 'RH{0:d}'.format(RH)
-        attributes['RH{0:d}'.format(RH)]['units'] = 'Meters'
-        attributes['RH{0:d}'.format(RH)]['description'] = ('Height relative to '
-            'the lowest detected mode at which {0:d}%  of the waveform '
-            'energy occurs').format(RH)
-    #-- Laser parmeters
-    #-- Azimuth
-    attributes['Azimuth'] = {}
-    attributes['Azimuth']['long_name'] = 'Azimuth'
-    attributes['Azimuth']['units'] = 'degrees'
-    attributes['Azimuth']['description'] = 'Azimuth angle of the laser beam.'
-    attributes['Azimuth']['valid_min'] = 0.0
-    attributes['Azimuth']['valid_max'] = 360.0
-    #-- Incident Angle
-    attributes['Incident_Angle'] = {}
-    attributes['Incident_Angle']['long_name'] = 'Incident_Angle'
-    attributes['Incident_Angle']['units'] = 'degrees'
-    attributes['Incident_Angle']['description'] = ('Off-nadir incident angle '
-        'of the laser beam.')
-    attributes['Incident_Angle']['valid_min'] = 0.0
-    attributes['Incident_Angle']['valid_max'] = 360.0
-    #-- Range
-    attributes['Range'] = {}
-    attributes['Range']['long_name'] = 'Range'
-    attributes['Range']['units'] = 'meters'
-    attributes['Range']['description'] = ('Distance between the instrument and '
-        'the ground.')
-    #-- Complexity
-    attributes['Complexity'] = {}
-    attributes['Complexity']['long_name'] = 'Complexity'
-    attributes['Complexity']['description'] = ('Complexity metric for the '
-        'return waveform.')
-    #-- Flags
-    attributes['Flag1'] = {}
-    attributes['Flag1']['long_name'] = 'Flag1'
-    attributes['Flag1']['description'] = ('Flag indicating LVIS channel used '
-        'to locate lowest detected mode.')
-    attributes['Flag2'] = {}
-    attributes['Flag2']['long_name'] = 'Flag1'
-    attributes['Flag2']['description'] = ('Flag indicating LVIS channel used '
-        'to calculate RH metrics.')
-    attributes['Flag3'] = {}
-    attributes['Flag3']['long_name'] = 'Flag1'
-    attributes['Flag3']['description'] = ('Flag indicating LVIS channel '
-        'waveform contained in Level-1B file.')
-
-    #-- Defining the HDF5 dataset variables
-    h5 = {}
-
-    #-- Defining Shot_Number dimension variable
-    h5['Shot_Number'] = fileID.create_dataset('Shot_Number', (n_records,),
-        data=ILVIS2_MDS['Shot_Number'], dtype=ILVIS2_MDS['Shot_Number'].dtype,
-        compression='gzip')
-    #-- add HDF5 variable attributes
-    for att_name,att_val in attributes['Shot_Number'].items():
-        h5['Shot_Number'].attrs[att_name] = att_val
-
-    #-- Time Variables
-    for k in ['LVIS_LFID','Time','J2000']:
-        v = ILVIS2_MDS[k]
-        h5[k] = fileID.create_dataset('Time/{0}'.format(k), (n_records,),
-            data=v, dtype=v.dtype, compression='gzip')
-        #-- attach dimensions
-        h5[k].dims[0].label='Shot_Number'
-        h5[k].dims[0].attach_scale(h5['Shot_Number'])
-        #-- add HDF5 variable attributes
-        for att_name,att_val in attributes[k].items():
-            h5[k].attrs[att_name] = att_val
-
-    #-- Geolocation Variables
-    if (LDS_VERSION == '1.04'):
-        geolocation_keys = ['Longitude_Centroid','Longitude_Low',
-            'Longitude_High','Latitude_Centroid','Latitude_Low','Latitude_High']
-    elif (LDS_VERSION == '2.0.2'):
-        geolocation_keys = ['Longitude_Low','Longitude_High','Longitude_Top',
-            'Latitude_Low','Latitude_High','Latitude_Top']
-    for k in geolocation_keys:
-        v = ILVIS2_MDS[k]
-        h5[k] = fileID.create_dataset('Geolocation/{0}'.format(k),
-            (n_records,), data=v, dtype=v.dtype, compression='gzip')
-        #-- attach dimensions
-        h5[k].dims[0].label='Shot_Number'
-        h5[k].dims[0].attach_scale(h5['Shot_Number'])
-        #-- add HDF5 variable attributes
-        for att_name,att_val in attributes[k].items():
-            h5[k].attrs[att_name] = att_val
-
-    #-- Elevation Surface Variables
-    if (LDS_VERSION == '1.04'):
-        elevation_keys = ['Elevation_Centroid','Elevation_Low','Elevation_High']
-    elif (LDS_VERSION == '2.0.2'):
-        elevation_keys = ['Elevation_Low','Elevation_High','Elevation_Top']
-    for k in elevation_keys:
-        v = ILVIS2_MDS[k]
-        h5[k] = fileID.create_dataset('Elevation_Surfaces/{0}'.format(k),
-            (n_records,), data=v, dtype=v.dtype, compression='gzip')
-        #-- attach dimensions
-        h5[k].dims[0].label='Shot_Number'
-        h5[k].dims[0].attach_scale(h5['Shot_Number'])
-        #-- add HDF5 variable attributes
-        for att_name,att_val in attributes[k].items():
-            h5[k].attrs[att_name] = att_val
-
-    #-- variables specific to the LDS version 2.0.2
-    if (LDS_VERSION == '2.0.2'):
-        #-- Waveform Variables
-        height_keys = ['RH10','RH15','RH20','RH25','RH30','RH35','RH40',
-            'RH45','RH50','RH55','RH60','RH65','RH70','RH75','RH80','RH85',
-            'RH90','RH95','RH96','RH97','RH98','RH99','RH100','Complexity']
-        for k in height_keys:
-            v = ILVIS2_MDS[k]
-            h5[k] = fileID.create_dataset('Waveform/{0}'.format(k),
-                (n_records,), data=v, dtype=v.dtype, compression='gzip')
-            #-- attach dimensions
-            h5[k].dims[0].label='Shot_Number'
-            h5[k].dims[0].attach_scale(h5['Shot_Number'])
-            #-- add HDF5 variable attributes
-            for att_name,att_val in attributes[k].items():
-                h5[k].attrs[att_name] = att_val
-
-        #-- instrument parameter variables
-        instrument_parameter_keys = ['Azimuth','Incident_Angle','Range','Flag1',
-            'Flag2','Flag3']
-        for k in instrument_parameter_keys:
-            v = ILVIS2_MDS[k]
-            h5[k]=fileID.create_dataset('Instrument_Parameters/{0}'.format(k),
-                (n_records,), data=v, dtype=v.dtype, compression='gzip')
-            #-- attach dimensions
-            h5[k].dims[0].label='Shot_Number'
-            h5[k].dims[0].attach_scale(h5['Shot_Number'])
-            #-- add HDF5 variable attributes
-            for att_name,att_val in attributes[k].items():
-                h5[k].attrs[att_name] = att_val
-
-
-    #-- Defining global attributes for output HDF5 file
-    fileID.attrs['featureType'] = 'trajectory'
-    fileID.attrs['title'] = 'IceBridge LVIS L2 Geolocated Surface Elevation'
-    fileID.attrs['comment'] = ('Operation IceBridge products may include test '
-        'flight data that are not useful for research and scientific analysis. '
-        'Test flights usually occur at the beginning of campaigns. Users '
-        'should read flight reports for the flights that collected any of the '
-        'data they intend to use')
-    fileID.attrs['summary'] = ("Surface elevation measurements over areas "
-        "including Greenland and Antarctica. The data were collected as part "
-        "of NASA Operation IceBridge funded campaigns.")
-    fileID.attrs['references'] = '{0}, {1}'.format('http://lvis.gsfc.nasa.gov/',
-        'http://nsidc.org/data/docs/daac/icebridge/ilvis2')
-    fileID.attrs['date_created'] = time.strftime('%Y-%m-%d',time.localtime())
-    fileID.attrs['project'] = 'NASA Operation IceBridge'
-    fileID.attrs['instrument'] = 'Land, Vegetation, and Ice Sensor (LVIS)'
-    fileID.attrs['processing_level'] = '2'
-    fileID.attrs['elevation_file'] = INPUT_FILE
-    #-- LVIS Data Structure (LDS) version
-    #-- https://lvis.gsfc.nasa.gov/Data/Data_Structure/DataStructure_LDS104.html
-    #-- https://lvis.gsfc.nasa.gov/Data/Data_Structure/DataStructure_LDS202.html
-    fileID.attrs['version'] = 'LDSv{0}'.format(LDS_VERSION)
-    #-- Geospatial and temporal parameters
-    fileID.attrs['geospatial_lat_min'] = ILVIS2_MDS['Latitude_Low'].min()
-    fileID.attrs['geospatial_lat_max'] = ILVIS2_MDS['Latitude_Low'].max()
-    fileID.attrs['geospatial_lon_min'] = ILVIS2_MDS['Longitude_Low'].min()
-    fileID.attrs['geospatial_lon_max'] = ILVIS2_MDS['Longitude_Low'].max()
-    fileID.attrs['geospatial_lat_units'] = "degrees_north"
-    fileID.attrs['geospatial_lon_units'] = "degrees_east"
-    fileID.attrs['geospatial_ellipsoid'] = "WGS84"
-    fileID.attrs['time_type'] = 'UTC'
-    fileID.attrs['date_type'] = 'J2000'
-    #-- convert start and end time from J2000 seconds into Julian days
-    J1 = ILVIS2_MDS['J2000'][0]/86400.0 + 2451545.0
-    J2 = ILVIS2_MDS['J2000'][-1]/86400.0 + 2451545.0
-    #-- convert to calendar date with convert_julian.py
-    cal_date = read_LVIS2_elevation.convert_julian(np.array([J1,J2]),ASTYPE='i')
-    args = (cal_date['hour'][0],cal_date['minute'][0],cal_date['second'][0])
-    fileID.attrs['RangeBeginningTime'] = '{0:02d}:{1:02d}:{2:02d}'.format(*args)
-    args = (cal_date['hour'][-1],cal_date['minute'][-1],cal_date['second'][-1])
-    fileID.attrs['RangeEndingTime'] = '{0:02d}:{1:02d}:{2:02d}'.format(*args)
-    args = (cal_date['year'][0],cal_date['month'][0],cal_date['day'][0])
-    fileID.attrs['RangeBeginningDate'] = '{0:4d}:{1:02d}:{2:02d}'.format(*args)
-    args = (cal_date['year'][-1],cal_date['month'][-1],cal_date['day'][-1])
-    fileID.attrs['RangeEndingDate'] = '{0:4d}:{1:02d}:{2:02d}'.format(*args)
-    time_coverage_duration = ILVIS2_MDS['J2000'][-1] - ILVIS2_MDS['J2000'][0]
-    fileID.attrs['DurationTime'] ='{0:0.0f}'.format(time_coverage_duration)
-    #-- Closing the HDF5 file
-    fileID.close()
-
 #-- Main program that calls nsidc_convert_ILVIS2()
 def main():
     #-- Read the system arguments listed after the program
@@ -579,11 +408,29 @@ def main():
     parser.add_argument('--clobber','-C',
         default=False, action='store_true',
         help='Overwrite existing data')
+    #-- number of threads for downloading and converting files
+    parser.add_argument('--threads','-T',
+        type=int, default=8,
+        help='Number of threads to use in file downloads')
+    #-- number of processes for reading and converting files
+    parser.add_argument('--processes','-P',
+        type=int, default=0,
+        help='Number of processes to use in reading and converting files')
+    #-- compression filter for output HDF5 datasets
+    parser.add_argument('--compression','-c',
+        type=str, default='lzf',
+        choices=('gzip','lzf','bitshuffle','lz4','zstd'),
+        help='Compression filter for output HDF5 datasets')
     #-- permissions mode of the local directories and files (number in octal)
     parser.add_argument('--mode','-M',
         type=lambda x: int(x,base=8), default=0o775,
         help='permissions mode of output files')
     args,_ = parser.parse_known_args()
+    #-- check that hdf5plugin is available for the additional filters
+    if (args.compression in ('bitshuffle','lz4','zstd')) and \
+        (importlib.util.find_spec('hdf5plugin') is None):
+        parser.error('hdf5plugin is required for {0} compression'.format(
+            args.compression))
     #-- NASA Earthdata hostname
     HOST = 'urs.earthdata.nasa.gov'
     #-- get authentication
@@ -593,20 +440,23 @@ def main():
         #-- check that NASA Earthdata credentials were entered
         if not args.user:
             prompt = 'Username for {0}: '.format(HOST)
-            args.user = builtins.input(prompt)
+            args.user = input(prompt)
         #-- enter password securely from command-line
         prompt = 'Password for {0}@{1}: '.format(args.user,HOST)
         PASSWORD = getpass.getpass(prompt)
-    #-- build a urllib opener for NSIDC
+    #-- build a requests session for NSIDC
     #-- Add the username and password for NASA Earthdata Login system
-    opener = read_LVIS2_elevation.utilities.build_opener(args.user,PASSWORD)
+    #-- keep a persistent connection available for each download thread
+    session = read_LVIS2_elevation.utilities.build_session(args.user,PASSWORD,
+        pool_maxsize=args.threads)
 
     #-- check internet connection before attempting to run program
     #-- check NASA earthdata credentials before attempting to run program
-    if read_LVIS2_elevation.utilities.check_credentials():
-        nsidc_convert_ILVIS2(args.directory, YEARS=args.year,
-            SUBDIRECTORY=args.subdirectory, CLOBBER=args.clobber,
-            MODE=args.mode)
+    if read_LVIS2_elevation.utilities.check_credentials(session=session):
+        nsidc_convert_ILVIS2(args.directory, SESSION=session, YEARS=args.year,
+            SUBDIRECTORY=args.subdirectory, THREADS=args.threads,
+            PROCESSES=args.processes, COMPRESSION=args.compression,
+            CLOBBER=args.clobber, MODE=args.mode)
 
 #-- run main program
 if __name__ == '__main__':
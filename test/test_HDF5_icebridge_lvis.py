@@ -0,0 +1,68 @@
+#!/usr/bin/env python
+u"""
+test_HDF5_icebridge_lvis.py (10/2026)
+Verify that chunks compressed outside of the HDF5 filter pipeline
+    can be read back with the HDF5 shuffle and gzip filters
+"""
+import h5py
+import pytest
+import numpy as np
+import concurrent.futures
+import read_LVIS2_elevation
+from read_LVIS2_elevation.read_LVIS2_elevation import _DTYPE_104
+from read_LVIS2_elevation.HDF5_icebridge_lvis import write_deflate_chunks
+
+#-- PURPOSE: compare directly written chunks with the input data
+@pytest.mark.parametrize("dtype", [np.float32, np.float64, np.int32])
+@pytest.mark.parametrize("n_records", [1, 1000, 2500])
+def test_deflate_chunks(tmp_path, dtype, n_records):
+    CHUNKSIZE = min(n_records, 1000)
+    data = np.random.default_rng(0).normal(size=n_records)*1000.0
+    data = data.astype(dtype)
+    FILENAME = tmp_path.joinpath('deflate.H5')
+    with h5py.File(FILENAME, 'w') as fileID, \
+        concurrent.futures.ThreadPoolExecutor(max_workers=2) as e:
+        dset = fileID.create_dataset('data', (n_records,), dtype=dtype,
+            chunks=(CHUNKSIZE,), compression='gzip', shuffle=True)
+        write_deflate_chunks(dset, data, CHUNKSIZE, e)
+    #-- read data back using the HDF5 filter pipeline
+    with h5py.File(FILENAME, 'r') as fileID:
+        assert fileID['data'].compression == 'gzip'
+        assert np.array_equal(fileID['data'][:], data)
+
+#-- PURPOSE: compare a gzip compressed output file with the input data
+def test_HDF5_icebridge_lvis_gzip(tmp_path):
+    n_records = 150001
+    rng = np.random.default_rng(1)
+    ILVIS2_MDS = {}
+    for key in _DTYPE_104.names:
+        ILVIS2_MDS[key] = rng.normal(size=n_records).astype(_DTYPE_104[key])
+    ILVIS2_MDS['Shot_Number'] = np.arange(n_records, dtype=np.int32)
+    ILVIS2_MDS['J2000'] = 2.0e8 + np.arange(n_records, dtype=np.float64)
+    FILENAME = tmp_path.joinpath('ILVIS2_GL2009_0412_R1408_012345.H5')
+    read_LVIS2_elevation.HDF5_icebridge_lvis(ILVIS2_MDS, '1.04',
+        FILENAME=FILENAME, INPUT_FILE=FILENAME.name, COMPRESSION='gzip',
+        THREADS=2)
+    with h5py.File(FILENAME, 'r') as fileID:
+        assert fileID['Shot_Number'].compression == 'gzip'
+        assert np.array_equal(fileID['Shot_Number'][:],
+            ILVIS2_MDS['Shot_Number'])
+        for group in ('Time','Geolocation','Elevation_Surfaces'):
+            for key,val in fileID[group].items():
+                assert val.compression == 'gzip'
+                assert np.array_equal(val[:], ILVIS2_MDS[key])
+
+#-- PURPOSE: read and output a granule without any shots
+@pytest.mark.filterwarnings("ignore:loadtxt")
+def test_HDF5_icebridge_lvis_empty(tmp_path):
+    input_file = tmp_path.joinpath('ILVIS2_GL2017_0712_R1803_043722.TXT')
+    input_file.write_text('# LVIS Level-2 header without any shots\n')
+    ILVIS2_MDS = read_LVIS2_elevation.read_LVIS2_elevation(input_file)
+    FILENAME = input_file.with_suffix('.H5')
+    read_LVIS2_elevation.HDF5_icebridge_lvis(ILVIS2_MDS,
+        ILVIS2_MDS['LDS_VERSION'], FILENAME=FILENAME,
+        INPUT_FILE=input_file.name, COMPRESSION='gzip')
+    with h5py.File(FILENAME, 'r') as fileID:
+        assert fileID['Shot_Number'].shape == (0,)
+        assert fileID['Instrument_Parameters/Flag1'].dtype == np.uint8
+        assert 'RangeBeginningTime' not in fileID.attrs.keys()
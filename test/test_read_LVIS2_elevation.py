@@ -0,0 +1,67 @@
+#!/usr/bin/env python
+u"""
+test_read_LVIS2_elevation.py (10/2026)
+Verify the julian days calculated from calendar dates
+Verify that subsetted reads match the subsetted full file
+Verify that structured outputs match the dictionary outputs
+"""
+import datetime
+import pytest
+import numpy as np
+import read_LVIS2_elevation
+from read_LVIS2_elevation.read_LVIS2_elevation import calc_julian_day
+
+#-- PURPOSE: compare julian days with the ordinal days of python dates
+def test_julian_day():
+    dates = [datetime.date(1800,1,1) + datetime.timedelta(days=d)
+        for d in range(0, 200000, 7)]
+    YEAR = np.array([d.year for d in dates], dtype=np.float64)
+    MONTH = np.array([d.month for d in dates], dtype=np.float64)
+    DAY = np.array([d.day for d in dates], dtype=np.float64)
+    #-- julian day at midnight of the first proleptic gregorian day
+    expected = np.array([d.toordinal() for d in dates]) + 1721424.5
+    assert np.array_equal(calc_julian_day(YEAR, MONTH, DAY), expected)
+    #-- scalar dates match the dates calculated as arrays
+    for d,JD in zip(dates[::1000], expected[::1000]):
+        assert calc_julian_day(float(d.year), float(d.month),
+            float(d.day)) == JD
+    #-- fractional days and times of day
+    assert calc_julian_day(2018.0, 10.0, 12.5) == 2458404.0
+    assert calc_julian_day(2000, 1, 1, HOUR=12) == 2451545.0
+
+#-- PURPOSE: compare subsetted reads with subsets of the full file
+@pytest.mark.parametrize("SUBSETTER", [[0], [0,1,2], [4,1,3], [5]])
+def test_read_subset(tmp_path, SUBSETTER):
+    input_file = write_test_file(tmp_path)
+    full = read_LVIS2_elevation.read_LVIS2_elevation(input_file)
+    subset = read_LVIS2_elevation.read_LVIS2_elevation(input_file,
+        SUBSETTER=SUBSETTER)
+    for key in full.keys():
+        if (key == 'LDS_VERSION'):
+            assert subset[key] == full[key]
+        else:
+            assert np.array_equal(subset[key], full[key][SUBSETTER])
+
+#-- PURPOSE: compare structured outputs with dictionary outputs
+def test_read_structured(tmp_path):
+    input_file = write_test_file(tmp_path)
+    full = read_LVIS2_elevation.read_LVIS2_elevation(input_file)
+    structured = read_LVIS2_elevation.read_LVIS2_elevation(input_file,
+        OUTPUT='structured')
+    assert structured['LDS_VERSION'] == full['LDS_VERSION']
+    assert np.array_equal(structured['J2000'], full['J2000'])
+    for key in structured['data'].dtype.names:
+        assert np.array_equal(structured['data'][key], full[key])
+
+#-- PURPOSE: write a LDS 1.04 file with comments and blank lines
+def write_test_file(tmp_path):
+    input_file = tmp_path.joinpath('ILVIS2_GL2009_0412_R1408_012345.TXT')
+    lines = ['# LVIS Level-2 header', '']
+    for i in range(6):
+        lines.append('{0:d} {1:d} {2:0.6f} {3}'.format(1000+i, 2000+i,
+            46800.0+i, ' '.join(['{0:0.4f}'.format(i+j/10.)
+            for j in range(9)])))
+        #-- blank lines and indented comments between data lines
+        lines.append('' if (i % 2) else '   # comment line {0:d}'.format(i))
+    input_file.write_text('\n'.join(lines) + '\n')
+    return input_file